@@ -1,6 +1,11 @@
+import argparse
 import json
 import os
-from typing import Dict, Any, List, Tuple, Set
+import re
+from typing import Dict, Any, Iterable, List, Tuple
+
+from checkpoint import CheckpointJournal, fingerprint, run_units
+from json_tree import collect_leaves
 
 def load_json_file(filepath: str) -> Dict[Any, Any]:
     """加载JSON文件"""
@@ -15,26 +20,8 @@ def load_json_file(filepath: str) -> Dict[Any, Any]:
         return {}
 
 def get_all_paths(data: Dict[Any, Any], prefix: str = "") -> List[Tuple[str, Any]]:
-    """递归获取JSON中所有的路径和值"""
-    paths = []
-    
-    if isinstance(data, dict):
-        for key, value in data.items():
-            current_path = f"{prefix}.{key}" if prefix else key
-            
-            if isinstance(value, (dict, list)):
-                paths.extend(get_all_paths(value, current_path))
-            else:
-                paths.append((current_path, value))
-    elif isinstance(data, list):
-        for i, value in enumerate(data):
-            current_path = f"{prefix}[{i}]"
-            if isinstance(value, (dict, list)):
-                paths.extend(get_all_paths(value, current_path))
-            else:
-                paths.append((current_path, value))
-    
-    return paths
+    """获取JSON中所有的路径和值"""
+    return collect_leaves(data, prefix)
 
 def get_value_by_path(data: Dict[Any, Any], path: str) -> Any:
     """根据路径获取JSON中的值"""
@@ -55,50 +42,45 @@ def get_value_by_path(data: Dict[Any, Any], path: str) -> Any:
     except (KeyError, IndexError, TypeError, ValueError):
         return None
 
-def build_translation_dictionary(translated_items: Dict[str, Dict]) -> Dict[str, Set[str]]:
-    """构建英文->中文翻译词典"""
+def is_translated(en_value: Any, zh_value: Any) -> bool:
+    """判断条目是否已翻译（中文值存在且与英文不同）"""
+    return zh_value is not None and zh_value != en_value
+
+def build_translation_dictionary(translated_items: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """构建英文->中文翻译词典，译文按首次出现的顺序排列"""
     translation_dict = {}
     for path, info in translated_items.items():
         en_text = info["english"]
         zh_text = info["chinese"]
         
-        if en_text not in translation_dict:
-            translation_dict[en_text] = set()
-        translation_dict[en_text].add(zh_text)
+        options = translation_dict.setdefault(en_text, [])
+        if zh_text not in options:
+            options.append(zh_text)
     
     return translation_dict
 
-def analyze_translations(en_file: str, zh_file: str) -> Dict[str, Any]:
-    """分析翻译状态"""
-    print("正在加载文件...")
-    en_data = load_json_file(en_file)
-    zh_data = load_json_file(zh_file)
-    
-    if not en_data:
-        print("英文文件加载失败")
-        return {}
-    
-    if not zh_data:
-        print("中文文件加载失败")
-        return {}
-    
-    print("正在分析翻译状态...")
-    en_paths = get_all_paths(en_data)
-    
+def group_paths_by_section(en_paths: Iterable[Tuple[str, Any]]) -> List[Tuple[str, List[Tuple[str, Any]]]]:
+    """将路径列表按顶层分区切分为连续的若干组，保持原有顺序"""
+    groups = []
+    section_prefixes = ()
+    for path, value in en_paths:
+        # 与上一条同属一个分区时无需重新解析路径
+        if not (path.startswith(section_prefixes) or (groups and path == groups[-1][0])):
+            section = get_top_level_section(path)
+            section_prefixes = (section + ".", section + "[")
+            groups.append((section, []))
+        groups[-1][1].append((path, value))
+    return groups
+
+def classify_entries(en_paths: List[Tuple[str, Any]], zh_data: Dict[Any, Any]) -> Dict[str, Dict[str, Any]]:
+    """将一组英文条目分为已翻译和未翻译两类"""
     translated = {}
     untranslated = {}
     
-    total_count = len(en_paths)
-    processed_count = 0
-    
     for path, en_value in en_paths:
-        processed_count += 1
-        if processed_count % 100 == 0:
-            print(f"处理进度: {processed_count}/{total_count}")
-        
         zh_value = get_value_by_path(zh_data, path)
         
-        if zh_value is not None and zh_value != en_value:
+        if is_translated(en_value, zh_value):
             # 已翻译（中文值存在且与英文不同）
             translated[path] = {
                 "english": en_value,
@@ -111,6 +93,44 @@ def analyze_translations(en_file: str, zh_file: str) -> Dict[str, Any]:
                 "status": "missing" if zh_value is None else "same_as_english"
             }
     
+    return {"translated": translated, "untranslated": untranslated}
+
+def analyze_translations(en_file: str, zh_file: str, journal: CheckpointJournal = None) -> Dict[str, Any]:
+    """分析翻译状态；提供检查点日志时按顶层分区记录进度，中断后可继续"""
+    print("正在加载文件...")
+    en_data = load_json_file(en_file)
+    zh_data = load_json_file(zh_file)
+    
+    if not en_data:
+        print("英文文件加载失败")
+        return {}
+    
+    if not zh_data:
+        print("中文文件加载失败")
+        return {}
+    
+    print("正在分析翻译状态...")
+    en_paths = get_all_paths(en_data)
+    total_count = len(en_paths)
+    processed_count = 0
+    
+    def classify_section(section_paths):
+        nonlocal processed_count
+        processed_count += len(section_paths)
+        print(f"处理进度: {processed_count}/{total_count}")
+        return classify_entries(section_paths, zh_data)
+    
+    units = [
+        (f"{index}:{section}", section_paths)
+        for index, (section, section_paths) in enumerate(group_paths_by_section(en_paths))
+    ]
+    
+    translated = {}
+    untranslated = {}
+    for section_result in run_units(units, classify_section, journal):
+        translated.update(section_result["translated"])
+        untranslated.update(section_result["untranslated"])
+    
     # 构建翻译词典
     print("正在分析已翻译词汇...")
     translation_dict = build_translation_dictionary(translated)
@@ -123,7 +143,7 @@ def analyze_translations(en_file: str, zh_file: str) -> Dict[str, Any]:
         en_text = info["english"]
         if en_text in translation_dict:
             # 这个英文已经在其他地方翻译过了
-            chinese_options = list(translation_dict[en_text])
+            chinese_options = translation_dict[en_text]
             potentially_translated[path] = {
                 "english": en_text,
                 "status": info["status"],
@@ -148,7 +168,7 @@ def analyze_translations(en_file: str, zh_file: str) -> Dict[str, Any]:
         "untranslated": untranslated,
         "potentially_translated": potentially_translated,
         "truly_untranslated": truly_untranslated,
-        "translation_dictionary": {k: list(v) for k, v in translation_dict.items()}
+        "translation_dictionary": translation_dict
     }
     
     return result
@@ -163,6 +183,58 @@ def save_untranslated_entries(untranslated: Dict[str, Any], output_file: str):
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(simplified, f, ensure_ascii=False, indent=2)
 
+def group_entries_by_english(untranslated: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """按英文原文分组未翻译条目，相同的文本只需翻译一次"""
+    grouped = {}
+    for path, info in untranslated.items():
+        en_text = info["english"]
+        group = grouped.get(en_text)
+        if group is None:
+            group = grouped[en_text] = {"translation": en_text, "paths": []}
+        group["paths"].append(path)
+    
+    return grouped
+
+def save_grouped_untranslated_entries(untranslated: Dict[str, Any], output_file: str):
+    """保存按英文原文去重后的翻译工作表"""
+    grouped = group_entries_by_english(untranslated)
+    
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(grouped, f, ensure_ascii=False, indent=2)
+    
+    return grouped
+
+# 顶层分区名之后的第一个分隔符
+_SECTION_SEPARATOR = re.compile(r'[.\[]')
+
+def get_top_level_section(path: str) -> str:
+    """获取路径所属的顶层分区，例如 'setting.file.xxx' -> 'setting'"""
+    match = _SECTION_SEPARATOR.search(path)
+    return path[:match.start()] if match else path
+
+def split_into_shards(untranslated: Dict[str, Any], shard_size: int = 0,
+                      by_section: bool = False) -> Dict[str, Dict[str, Any]]:
+    """将未翻译条目拆分为多个分片，按固定条目数或按顶层分区"""
+    shards = {}
+    if by_section:
+        for path, info in untranslated.items():
+            name = f"section_{get_top_level_section(path)}"
+            shards.setdefault(name, {})[path] = info["english"]
+    else:
+        items = list(untranslated.items())
+        for start in range(0, len(items), shard_size):
+            name = f"shard_{start // shard_size + 1:03d}"
+            shards[name] = {path: info["english"] for path, info in items[start:start + shard_size]}
+    
+    return shards
+
+def save_shards(shards: Dict[str, Dict[str, Any]], shard_dir: str):
+    """保存分片文件；已存在的文件可能是译者放回的译文，不会被覆盖"""
+    os.makedirs(shard_dir, exist_ok=True)
+    for name, entries in shards.items():
+        with open(os.path.join(shard_dir, f"{name}.json"), 'x', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+
 def save_potentially_translated_entries(potentially_translated: Dict[str, Any], output_file: str):
     """保存可能已翻译的条目到文件"""
     simplified = {}
@@ -176,8 +248,24 @@ def save_potentially_translated_entries(potentially_translated: Dict[str, Any],
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(simplified, f, ensure_ascii=False, indent=2)
 
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Obsidian 翻译状态分析与准备工具")
+    shard_group = parser.add_mutually_exclusive_group()
+    shard_group.add_argument("--shard-size", type=int, default=0, metavar="N",
+                             help="将未翻译条目按每 N 条拆分为多个分片，便于多人协作")
+    shard_group.add_argument("--shard-by-section", action="store_true",
+                             help="将未翻译条目按顶层分区 (setting, editor, ...) 拆分为多个分片")
+    parser.add_argument("--checkpoint", metavar="DIR",
+                        help="按顶层分区记录检查点，中断后使用相同参数重新运行即可从断点继续")
+    args = parser.parse_args()
+    if args.shard_size < 0:
+        parser.error("--shard-size 必须为正整数")
+    return args
+
 def main():
     """主函数"""
+    args = parse_args()
     print("=== Obsidian 翻译状态分析与准备工具 ===")
     
     # 文件路径
@@ -194,6 +282,8 @@ def main():
     report_file = os.path.join(output_dir, "translation_report.json")
     untranslated_file = os.path.join(output_dir, "untranslated_entries.json")
     potentially_file = os.path.join(output_dir, "potentially_translated_entries.json")
+    grouped_file = os.path.join(output_dir, "untranslated_grouped.json")
+    shard_dir = os.path.join(output_dir, "shards")
     
     # 检查文件是否存在
     if not os.path.exists(en_file):
@@ -206,8 +296,21 @@ def main():
         print(f"💡 提示: 请将 zh.json 文件放入 '{input_dir}/' 目录。")
         return
     
+    # 分片目录由译者放回译文，非空时拒绝写入，避免覆盖他们的工作
+    if (args.shard_size or args.shard_by_section) and os.path.isdir(shard_dir) and os.listdir(shard_dir):
+        print(f"❌ 错误: 分片目录 {shard_dir} 非空，其中可能有译者放回的译文")
+        print(f"💡 提示: 请先合并或移走该目录中的文件，再重新拆分分片。")
+        return
+    
     # 分析翻译状态
-    result = analyze_translations(en_file, zh_file)
+    journal = None
+    if args.checkpoint:
+        try:
+            journal = CheckpointJournal(args.checkpoint, fingerprint(en_file, zh_file))
+        except ValueError as e:
+            print(f"❌ 错误: {e}")
+            return
+    result = analyze_translations(en_file, zh_file, journal)
     
     if not result:
         print("分析失败")
@@ -231,17 +334,37 @@ def main():
     print(f"💾 正在保存【所有未翻译】条目到: {untranslated_file}")
     save_untranslated_entries(result["untranslated"], untranslated_file)
     
+    # 保存按英文原文去重的工作表
+    print(f"💾 正在保存【去重工作表】到: {grouped_file}")
+    grouped = save_grouped_untranslated_entries(result["untranslated"], grouped_file)
+    print(f"   {summary['untranslated_count']} 个条目合并为 {len(grouped)} 个唯一英文文本")
+    
     # 保存可能已翻译的条目
     print(f"💾 正在保存【可能已翻译】的条目到: {potentially_file}")
     save_potentially_translated_entries(result["potentially_translated"], potentially_file)
     
+    # 按需拆分分片
+    if args.shard_size or args.shard_by_section:
+        shards = split_into_shards(result["untranslated"], args.shard_size, args.shard_by_section)
+        print(f"💾 正在保存 {len(shards)} 个分片到: {shard_dir}")
+        save_shards(shards, shard_dir)
+    
+    # 所有输出已写完，检查点不再需要
+    if journal is not None:
+        journal.clear()
+    
     print(f"\n✅ 分析完成！")
     print(f"\n📝 下一步操作:")
     print(f"1. 在 '{output_dir}/' 目录下找到 'untranslated_entries.json'。")
     print(f"2. 将 'untranslated_entries.json' 复制到 '{input_dir}/' 目录并重命名为 'manual_translations.json'。")
     print(f"3. 打开并编辑 '{os.path.join(input_dir, 'manual_translations.json')}' 文件，完成翻译。")
+    print(f"   (可选) 也可以改用 'untranslated_grouped.json'，相同英文只需填写一次 'translation'，")
+    print(f"   个别路径需要不同译文时写入该组的 'overrides': {{\"路径\": \"译文\"}}。")
     print(f"4. (可选) 参考 '{potentially_file}' 文件获取翻译建议。")
     print(f"5. 运行 'python merge_translations.py' 来合并您的翻译。")
+    if args.shard_size or args.shard_by_section:
+        print(f"\n👥 多人协作: 将 '{shard_dir}/' 中的分片分发给各位译者，")
+        print(f"   收回后放入同一目录，运行 'python merge_translations.py --shards <目录>' 统一合并。")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+def atomic_write_json(data: Any, output_file: str, **dump_kwargs):
+    """先写入临时文件再原子重命名，中途中断不会留下半个文件"""
+    temp_file = f"{output_file}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, **dump_kwargs)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, output_file)
+
+def fingerprint(*parts: Any) -> str:
+    """计算输入的指纹：文件按内容计算，其他参数按 JSON 表示计算"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str) and os.path.isfile(part):
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        else:
+            digest.update(json.dumps(part, sort_keys=True).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def _unit_filename(number: int) -> str:
+    return f"unit_{number:05d}.json"
+
+def _is_unit_filename(name: Any) -> bool:
+    return isinstance(name, str) and re.fullmatch(r"unit_\d{5,}\.json", name) is not None
+
+class CheckpointJournal:
+    """按单元（分区、语言等）记录已完成结果的检查点日志
+
+    每个单元的结果原子写入独立文件，随后在只追加的 journal.jsonl 中登记。
+    重新运行时，指纹相同的日志中已登记的单元直接读取结果，从下一个单元继续；
+    指纹不同（输入或参数变化）时丢弃旧日志重新开始。
+
+    只会删除日志本身和日志中登记过的单元文件，目录中的其他文件不会被触及；
+    目录已存在、非空却没有日志时拒绝使用，抛出 ValueError。
+    """
+
+    def __init__(self, directory: str, run_fingerprint: str):
+        self.directory = directory
+        self.journal_file = os.path.join(directory, "journal.jsonl")
+        self.fingerprint = run_fingerprint
+        self.completed = {}
+        self.unit_files = []  # 日志中登记过的全部单元文件，包括已丢失的
+
+        if os.path.exists(self.journal_file):
+            if not self._load():
+                print(f"检查点 {directory} 与本次输入不一致，已重新开始")
+                self.clear()
+        elif os.path.isdir(directory) and os.listdir(directory):
+            raise ValueError(f"检查点目录 {directory} 非空且没有检查点日志，请指定一个新的或空的目录")
+
+        os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self.journal_file):
+            self._append({"fingerprint": run_fingerprint})
+
+    def _load(self) -> bool:
+        """读取日志，指纹一致时返回 True
+
+        写入中断留下的不完整记录会被截掉，之后追加的记录从完整的行尾开始写。
+        """
+        with open(self.journal_file, "rb") as f:
+            data = f.read()
+
+        records = []
+        complete_size = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                records.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                break
+            complete_size += len(line)
+
+        if complete_size < len(data):
+            with open(self.journal_file, "r+b") as f:
+                f.truncate(complete_size)
+                os.fsync(f.fileno())
+
+        # 只接受本类写出的单元文件名，日志被改坏时也不会删除目录外或其他文件
+        self.unit_files = [
+            record["file"] for record in records[1:]
+            if _is_unit_filename(record.get("file"))
+        ]
+        if not records or records[0].get("fingerprint") != self.fingerprint:
+            return False
+
+        for record in records[1:]:
+            if record.get("file") in self.unit_files and os.path.exists(os.path.join(self.directory, record["file"])):
+                self.completed[record["unit"]] = record["file"]
+        return True
+
+    def _append(self, record: Dict[str, Any]):
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def __contains__(self, unit: str) -> bool:
+        return unit in self.completed
+
+    def load(self, unit: str) -> Any:
+        """读取已完成单元的结果"""
+        with open(os.path.join(self.directory, self.completed[unit]), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def record(self, unit: str, result: Any):
+        """保存单元结果并登记为已完成"""
+        # 编号取自日志中的记录数而不是已完成数，文件丢失被跳过的记录不会导致编号重复
+        filename = _unit_filename(len(self.unit_files))
+        atomic_write_json(result, os.path.join(self.directory, filename))
+        self._append({"unit": unit, "file": filename})
+        self.unit_files.append(filename)
+        self.completed[unit] = filename
+
+    def clear(self):
+        """删除日志及其登记的单元文件；目录为空时一并删除"""
+        # 中断时正在写入的下一个单元可能留下结果文件或临时文件，但还没有登记
+        pending = _unit_filename(len(self.unit_files))
+        for filename in [*self.unit_files, pending, f"{pending}.tmp"]:
+            path = os.path.join(self.directory, filename)
+            if os.path.exists(path):
+                os.remove(path)
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self.unit_files = []
+        self.completed = {}
+
+        try:
+            os.rmdir(self.directory)
+        except OSError:
+            pass  # 目录中还有其他文件，保留目录
+
+def run_units(units: Iterable[Tuple[str, Any]], compute: Callable[[Any], Any],
+              journal: CheckpointJournal = None) -> List[Any]:
+    """按顺序计算各单元，已在检查点中完成的单元直接复用结果
+
+    units 为 (单元名, 输入) 序列，返回与之顺序一致的结果列表。
+    """
+    results = []
+    resumed = 0
+    for unit, unit_input in units:
+        if journal is not None and unit in journal:
+            results.append(journal.load(unit))
+            resumed += 1
+            continue
+
+        result = compute(unit_input)
+        if journal is not None:
+            journal.record(unit, result)
+        results.append(result)
+
+    if resumed:
+        print(f"从检查点恢复了 {resumed} 个已完成的单元")
+    return results
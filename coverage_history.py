@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import subprocess
+from typing import Dict, Any, List
+
+from checkpoint import atomic_write_json
+from analyze_translations import (
+    get_all_paths,
+    get_top_level_section,
+    get_value_by_path,
+    is_translated,
+)
+
+# 缓存格式版本，统计规则变化时递增以使旧缓存失效
+CACHE_VERSION = 1
+
+# 每新计算多少个版本写一次缓存，中断后已完成的部分不会丢失
+CACHE_FLUSH_INTERVAL = 20
+
+class GitCatFile:
+    """通过一个常驻的 git cat-file 进程批量读取对象"""
+
+    def __init__(self, repo: str, mode: str):
+        self.process = subprocess.Popen(
+            ["git", "-C", repo, "cat-file", mode],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def request(self, name: str) -> List[str]:
+        """请求一个对象，返回头部字段：<sha> <type> <size>，对象不存在时为 <name> missing"""
+        self.process.stdin.write(name.encode("utf-8") + b"\n")
+        self.process.stdin.flush()
+        return self.process.stdout.readline().decode("utf-8").split()
+
+    def read_content(self, header: List[str]) -> bytes:
+        """读取 --batch 模式下紧跟在头部之后的对象内容"""
+        size = int(header[2])
+        content = self.process.stdout.read(size)
+        self.process.stdout.read(1)  # 内容后的换行符
+        return content
+
+    def close(self):
+        self.process.stdin.close()
+        self.process.wait()
+
+def list_commits(repo: str, rev: str, paths: List[str]) -> List[Dict[str, str]]:
+    """按时间顺序列出修改过指定文件的提交"""
+    output = subprocess.run(
+        ["git", "-C", repo, "log", "--reverse", "--format=%H%x09%cI%x09%s", rev, "--", *paths],
+        check=True, capture_output=True, text=True, encoding="utf-8",
+    ).stdout
+
+    commits = []
+    for line in output.splitlines():
+        sha, date, subject = line.split("\t", 2)
+        commits.append({"commit": sha, "date": date, "subject": subject})
+    return commits
+
+def resolve_blobs(repo: str, commits: List[Dict[str, str]], en_path: str, zh_path: str):
+    """通过一个 --batch-check 流解析每个提交中英文/中文文件对应的 blob SHA"""
+    reader = GitCatFile(repo, "--batch-check")
+    try:
+        for commit in commits:
+            for key, path in (("en_blob", en_path), ("zh_blob", zh_path)):
+                header = reader.request(f"{commit['commit']}:{path}")
+                commit[key] = header[0] if len(header) == 3 and header[1] == "blob" else None
+    finally:
+        reader.close()
+
+def compute_coverage(en_data: Dict[Any, Any], zh_data: Dict[Any, Any]) -> Dict[str, Any]:
+    """按 analyze_translations() 的规则统计整体及各顶层分区的翻译覆盖率"""
+    total = 0
+    translated = 0
+    sections = {}
+
+    for path, en_value in get_all_paths(en_data):
+        section = sections.setdefault(get_top_level_section(path), {"total_items": 0, "translated_count": 0})
+        section["total_items"] += 1
+        total += 1
+        if is_translated(en_value, get_value_by_path(zh_data, path)):
+            section["translated_count"] += 1
+            translated += 1
+
+    for section in sections.values():
+        section["translation_rate"] = round(section["translated_count"] / section["total_items"] * 100, 2)
+
+    return {
+        "total_items": total,
+        "translated_count": translated,
+        "translation_rate": round(translated / total * 100, 2) if total else 0.0,
+        "sections": sections,
+    }
+
+def load_cache(cache_file: str) -> Dict[str, Any]:
+    """加载以 blob SHA 对为键的覆盖率缓存"""
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"缓存读取失败，将重新计算: {e}")
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("coverage", {})
+
+def save_cache(cache: Dict[str, Any], cache_file: str):
+    """原子地保存覆盖率缓存"""
+    atomic_write_json({"version": CACHE_VERSION, "coverage": cache}, cache_file)
+
+def build_coverage_history(repo: str, rev: str, en_path: str, zh_path: str,
+                           cache: Dict[str, Any], cache_file: str) -> List[Dict[str, Any]]:
+    """计算每个提交的翻译覆盖率；已缓存的 blob 组合不会重新读取和分析
+
+    缓存会定期写入 cache_file，中断后重新运行会从未计算的版本继续。
+    """
+    print(f"正在列出 {en_path} / {zh_path} 的提交历史...")
+    commits = list_commits(repo, rev, [en_path, zh_path])
+    resolve_blobs(repo, commits, en_path, zh_path)
+    print(f"共 {len(commits)} 个提交")
+
+    # 每个 blob 最后一次被未缓存的提交用到的位置；解析结果保留到该位置为止，
+    # 文件回退到旧版本时也不会重复读取和解析
+    last_use = {}
+    for position, commit in enumerate(commits):
+        en_blob, zh_blob = commit["en_blob"], commit["zh_blob"]
+        if en_blob and zh_blob and f"{en_blob}:{zh_blob}" not in cache:
+            last_use[en_blob] = last_use[zh_blob] = position
+
+    reader = None
+    parsed = {}  # {blob SHA: 解析结果}，只保留之后还会用到的 blob
+    history = []
+    computed = 0
+
+    try:
+        for position, commit in enumerate(commits):
+            en_blob, zh_blob = commit["en_blob"], commit["zh_blob"]
+            if not en_blob or not zh_blob:
+                continue
+
+            cache_key = f"{en_blob}:{zh_blob}"
+            if cache_key not in cache:
+                if reader is None:
+                    reader = GitCatFile(repo, "--batch")
+                for blob in (en_blob, zh_blob):
+                    if blob not in parsed:
+                        header = reader.request(blob)
+                        try:
+                            parsed[blob] = json.loads(reader.read_content(header))
+                        except json.JSONDecodeError as e:
+                            print(f"JSON解析错误 {commit['commit'][:10]} ({blob[:10]}): {e}")
+                            parsed[blob] = None
+
+                en_data, zh_data = parsed[en_blob], parsed[zh_blob]
+                if not isinstance(en_data, dict) or not isinstance(zh_data, dict):
+                    cache[cache_key] = None
+                else:
+                    cache[cache_key] = compute_coverage(en_data, zh_data)
+                computed += 1
+                if computed % CACHE_FLUSH_INTERVAL == 0:
+                    save_cache(cache, cache_file)
+
+            for blob in (en_blob, zh_blob):
+                if last_use.get(blob) == position:
+                    parsed.pop(blob, None)
+
+            coverage = cache[cache_key]
+            if coverage is not None:
+                history.append(dict(commit, **coverage))
+    finally:
+        if reader is not None:
+            reader.close()
+
+    print(f"新计算 {computed} 个版本，其余 {len(commits) - computed} 个来自缓存或已跳过")
+    return history
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="统计翻译覆盖率随 git 历史的变化")
+    parser.add_argument("repo", help="obsidian-translations 仓库的本地克隆路径")
+    parser.add_argument("--rev", default="HEAD", help="要统计的分支或提交范围 (默认: HEAD)")
+    parser.add_argument("--en-path", default="en.json", help="仓库中英文文件的路径 (默认: en.json)")
+    parser.add_argument("--zh-path", default="zh.json", help="仓库中中文文件的路径 (默认: zh.json)")
+    return parser.parse_args()
+
+def main():
+    """主函数"""
+    args = parse_args()
+    print("=== 翻译覆盖率历史统计 ===")
+
+    output_dir = "output_history"
+    os.makedirs(output_dir, exist_ok=True)
+    history_file = os.path.join(output_dir, "coverage_history.json")
+    cache_file = os.path.join(output_dir, "coverage_cache.json")
+
+    if not os.path.isdir(args.repo):
+        print(f"❌ 错误: 找不到仓库目录 {args.repo}")
+        return
+
+    cache = load_cache(cache_file)
+    try:
+        history = build_coverage_history(args.repo, args.rev, args.en_path, args.zh_path, cache, cache_file)
+    except subprocess.CalledProcessError as e:
+        print(f"❌ 错误: git 命令执行失败: {e.stderr.strip()}")
+        return
+    save_cache(cache, cache_file)
+
+    print(f"\n💾 正在保存覆盖率历史到: {history_file}")
+    atomic_write_json(history, history_file, indent=2)
+
+    if history:
+        print("\n📈 最近的覆盖率:")
+        for entry in history[-5:]:
+            print(f"  {entry['date'][:10]} {entry['commit'][:10]} "
+                  f"{entry['translated_count']}/{entry['total_items']} ({entry['translation_rate']}%)")
+
+    print(f"\n✅ 统计完成！共 {len(history)} 个数据点")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from typing import Any, Iterator, Tuple
+
+from json_tree import iter_leaves
+
+# 索引文件格式
+#
+#   头部        INDEX_HEADER
+#   token 偏移  uint32 × (token 数 + 1)   指向 token 字节区
+#   路径前缀    uint32 × 路径数           前缀 token 编号
+#   路径末段    uint32 × 路径数           对象键: token 编号 << 1；数组下标: 下标 << 1 | 1
+#   值偏移      uint32 × (路径数 + 1)     指向值字节区
+#   哈希槽      uint32 × 槽数             路径编号 + 1，0 表示空槽（线性探测）
+#   token 字节区 / 值字节区
+#
+# 路径前缀和对象键都作为 token 去重存放，同一分区下的条目共享同一个前缀。
+# 字符串值以 b"s" + UTF-8 存放，其他类型以 b"j" + JSON 存放。
+#
+# 头部固定为小端序；uint32 数组按构建机器的本机字节序存放，以便直接用
+# memoryview.cast 映射。头部最后一个字段记录该字节序，字节序不同的机器读取
+# 时会当作无效索引并重建。
+INDEX_MAGIC = b"ENIDX\x00\x00\x01"
+INDEX_HEADER = struct.Struct("<8s32s6I")
+NATIVE_BYTE_ORDER = 0 if sys.byteorder == "little" else 1
+
+def content_hash(filepath: str) -> bytes:
+    """计算文件内容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+def _path_hash(path: str) -> int:
+    """跨进程稳定的路径哈希（内置 hash() 每个进程的种子不同）"""
+    return zlib.crc32(path.encode("utf-8"))
+
+def _join_path(prefix: str, leaf: Any) -> str:
+    """按 iter_leaves 的规则拼接路径"""
+    if isinstance(leaf, int):
+        return f"{prefix}[{leaf}]"
+    return f"{prefix}.{leaf}" if prefix else leaf
+
+def build_index(en_file: str, index_file: str):
+    """解析 en.json 并写出只读索引文件"""
+    with open(en_file, "rb") as f:
+        raw = f.read()
+    en_data = json.loads(raw)
+
+    tokens = {}
+    prefixes = array("I")
+    leaves = array("I")
+    value_offsets = array("I", [0])
+    value_blob = bytearray()
+    paths = []
+
+    def intern(token: str) -> int:
+        token_id = tokens.get(token)
+        if token_id is None:
+            token_id = tokens[token] = len(tokens)
+        return token_id
+
+    for path, key, value in iter_leaves(en_data, with_keys=True):
+        if isinstance(key, int):
+            prefix = path[:-len(f"[{key}]")]
+            leaves.append(key << 1 | 1)
+        else:
+            prefix = path[:-len(key) - 1] if path != key else ""
+            leaves.append(intern(key) << 1)
+        prefixes.append(intern(prefix))
+
+        if isinstance(value, str):
+            value_blob += b"s" + value.encode("utf-8")
+        else:
+            value_blob += b"j" + json.dumps(value, ensure_ascii=False).encode("utf-8")
+        value_offsets.append(len(value_blob))
+        paths.append(path)
+
+    token_offsets = array("I", [0])
+    token_blob = bytearray()
+    for token in tokens:
+        token_blob += token.encode("utf-8")
+        token_offsets.append(len(token_blob))
+
+    # 装载因子不超过 0.5 的开放寻址哈希表
+    slot_count = 1
+    while slot_count < len(paths) * 2:
+        slot_count <<= 1
+    slots = array("I", bytes(4 * slot_count))
+    for path_id, path in enumerate(paths):
+        slot = _path_hash(path) & (slot_count - 1)
+        # 重复路径以最后出现的条目为准，与 dict(get_all_paths(...)) 一致
+        while slots[slot] and paths[slots[slot] - 1] != path:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = path_id + 1
+
+    arrays = [token_offsets, prefixes, leaves, value_offsets, slots]
+    header = INDEX_HEADER.pack(
+        INDEX_MAGIC, hashlib.sha256(raw).digest(),
+        len(tokens), len(paths), slot_count, len(token_blob), len(value_blob), NATIVE_BYTE_ORDER,
+    )
+
+    # 每次构建使用独立的临时文件，多个进程同时重建时不会写进同一个文件，
+    # 最后一个完成的 os.replace 生效，发布的始终是某一次完整的构建结果
+    fd, temp_file = tempfile.mkstemp(
+        dir=os.path.dirname(index_file) or ".",
+        prefix=f"{os.path.basename(index_file)}.", suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            for items in arrays:
+                f.write(items.tobytes())
+            f.write(token_blob)
+            f.write(value_blob)
+        os.chmod(temp_file, 0o644)
+        os.replace(temp_file, index_file)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+
+class EnglishIndex:
+    """以内存映射方式打开的 en.json 只读索引
+
+    多个进程打开同一个索引文件时共享同一份页面缓存；对象本身按文件路径序列化，
+    传给子进程时只会重新映射文件，不会复制数据。
+    """
+
+    def __init__(self, index_file: str):
+        self.index_file = index_file
+        with open(index_file, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < INDEX_HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"英文索引文件不完整: {index_file}")
+
+        (magic, self.content_hash, token_count, path_count, slot_count,
+         token_blob_size, value_blob_size, byte_order) = INDEX_HEADER.unpack_from(self._mmap, 0)
+        if magic != INDEX_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"不是有效的英文索引文件: {index_file}")
+        if byte_order != NATIVE_BYTE_ORDER:
+            self._mmap.close()
+            raise ValueError(f"英文索引文件的字节序与本机不同: {index_file}")
+
+        # 文件被截断或写坏时，头部声明的大小与实际大小不一致
+        expected_size = (
+            INDEX_HEADER.size
+            + 4 * (token_count + 1 + path_count * 2 + path_count + 1 + slot_count)
+            + token_blob_size + value_blob_size
+        )
+        actual_size = len(self._mmap)
+        if expected_size != actual_size:
+            self._mmap.close()
+            raise ValueError(f"英文索引文件大小不符 (应为 {expected_size} 字节，实际 {actual_size} 字节): {index_file}")
+
+        view = memoryview(self._mmap)
+        offset = INDEX_HEADER.size
+
+        def take_uint32(count):
+            nonlocal offset
+            items = view[offset:offset + 4 * count].cast("I")
+            offset += 4 * count
+            return items
+
+        self._token_offsets = take_uint32(token_count + 1)
+        self._prefixes = take_uint32(path_count)
+        self._leaves = take_uint32(path_count)
+        self._value_offsets = take_uint32(path_count + 1)
+        self._slots = take_uint32(slot_count)
+        self._token_blob_start = offset
+        self._value_blob_start = offset + token_blob_size
+        self._slot_mask = slot_count - 1
+        self._tokens = {}
+
+    def __reduce__(self):
+        return (EnglishIndex, (self.index_file,))
+
+    def __len__(self) -> int:
+        return len(self._prefixes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """释放内存映射"""
+        for name in ("_token_offsets", "_prefixes", "_leaves", "_value_offsets", "_slots"):
+            getattr(self, name).release()
+        self._mmap.close()
+
+    def _token(self, token_id: int) -> str:
+        token = self._tokens.get(token_id)
+        if token is None:
+            start = self._token_blob_start + self._token_offsets[token_id]
+            end = self._token_blob_start + self._token_offsets[token_id + 1]
+            token = self._tokens[token_id] = self._mmap[start:end].decode("utf-8")
+        return token
+
+    def path(self, path_id: int) -> str:
+        """返回第 path_id 个条目的路径"""
+        leaf = self._leaves[path_id]
+        return _join_path(self._token(self._prefixes[path_id]), leaf >> 1 if leaf & 1 else self._token(leaf >> 1))
+
+    def value(self, path_id: int) -> Any:
+        """返回第 path_id 个条目的英文值"""
+        start = self._value_blob_start + self._value_offsets[path_id]
+        end = self._value_blob_start + self._value_offsets[path_id + 1]
+        raw = self._mmap[start:end]
+        if raw[:1] == b"s":
+            return raw[1:].decode("utf-8")
+        return json.loads(raw[1:])
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """按 en.json 中的顺序返回 (路径, 值)，与 get_all_paths() 的结果一致"""
+        blob = self._mmap
+        tokens = [
+            blob[self._token_blob_start + begin:self._token_blob_start + end].decode("utf-8")
+            for begin, end in zip(self._token_offsets, self._token_offsets[1:])
+        ]
+        value_start = self._value_blob_start
+        value_offsets = self._value_offsets
+        for prefix_id, leaf, begin, end in zip(self._prefixes, self._leaves, value_offsets, value_offsets[1:]):
+            prefix = tokens[prefix_id]
+            if leaf & 1:
+                path = f"{prefix}[{leaf >> 1}]"
+            else:
+                key = tokens[leaf >> 1]
+                path = f"{prefix}.{key}" if prefix else key
+
+            raw = blob[value_start + begin:value_start + end]
+            yield path, raw[1:].decode("utf-8") if raw[0] == 0x73 else json.loads(raw[1:])
+
+    def find(self, path: str) -> int:
+        """查找路径对应的条目编号，不存在时返回 -1"""
+        slot = _path_hash(path) & self._slot_mask
+        while True:
+            entry = self._slots[slot]
+            if not entry:
+                return -1
+            if self.path(entry - 1) == path:
+                return entry - 1
+            slot = (slot + 1) & self._slot_mask
+
+    def get(self, path: str, default: Any = None) -> Any:
+        """按路径查找英文值，接口与 dict.get 相同"""
+        path_id = self.find(path)
+        return default if path_id < 0 else self.value(path_id)
+
+    def __contains__(self, path: str) -> bool:
+        return self.find(path) >= 0
+
+def default_index_file(en_file: str) -> str:
+    """默认索引文件位置：与 en.json 同目录"""
+    return os.path.splitext(en_file)[0] + ".index"
+
+def open_english_index(en_file: str, index_file: str = None) -> EnglishIndex:
+    """打开 en.json 的索引；索引不存在或 en.json 内容变化时先重建"""
+    index_file = index_file or default_index_file(en_file)
+    expected_hash = content_hash(en_file)
+
+    if os.path.exists(index_file):
+        try:
+            index = EnglishIndex(index_file)
+        except (OSError, ValueError, struct.error):
+            index = None
+        if index is not None and index.content_hash == expected_hash:
+            return index
+        if index is not None:
+            index.close()
+
+    print(f"正在为 {en_file} 构建索引: {index_file}")
+    build_index(en_file, index_file)
+    return EnglishIndex(index_file)
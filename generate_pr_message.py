@@ -1,7 +1,15 @@
+import argparse
+import io
 import json
 import os
 from datetime import datetime
-from typing import Dict, Any, List, Tuple
+from itertools import islice
+from typing import Dict, Any, List, Mapping, Tuple, TextIO
+
+from analyze_translations import group_paths_by_section
+from checkpoint import CheckpointJournal, fingerprint, run_units
+from en_index import EnglishIndex, open_english_index
+from json_tree import collect_leaves
 
 def load_json_file(filepath: str) -> Dict[Any, Any]:
     """加载JSON文件"""
@@ -15,71 +23,100 @@ def load_json_file(filepath: str) -> Dict[Any, Any]:
         print(f"JSON解析错误 {filepath}: {e}")
         return {}
 
+def load_english_index(en_file: str):
+    """打开英文文件的内存映射索引，只在有变更的条目上按路径查询，无需解析整个 en.json
+
+    索引无法构建或打开时（目录只读、权限不足等）退回到直接解析 en.json。
+    """
+    try:
+        return open_english_index(en_file)
+    except (OSError, ValueError) as e:
+        print(f"英文索引加载失败，改为直接解析 {en_file}: {e}")
+        return get_all_paths(load_json_file(en_file))
+
 def get_all_paths(data: Dict[Any, Any], prefix: str = "") -> Dict[str, Any]:
-    """递归获取JSON中所有的路径和值"""
-    paths = {}
-    
-    if isinstance(data, dict):
-        for key, value in data.items():
-            current_path = f"{prefix}.{key}" if prefix else key
-            
-            if isinstance(value, (dict, list)):
-                paths.update(get_all_paths(value, current_path))
-            else:
-                paths[current_path] = value
-    elif isinstance(data, list):
-        for i, value in enumerate(data):
-            current_path = f"{prefix}[{i}]"
-            if isinstance(value, (dict, list)):
-                paths.update(get_all_paths(value, current_path))
-            else:
-                paths[current_path] = value
-    
-    return paths
-
-def analyze_translation_changes(old_zh_file: str, new_zh_file: str, en_file: str = None) -> Dict[str, Any]:
-    """分析翻译变更"""
-    print("正在分析翻译变更...")
-    
-    old_data = load_json_file(old_zh_file)
-    new_data = load_json_file(new_zh_file)
-    en_data = load_json_file(en_file) if en_file and os.path.exists(en_file) else {}
-    
-    old_paths = get_all_paths(old_data)
-    new_paths = get_all_paths(new_data)
-    en_paths = get_all_paths(en_data) if en_data else {}
-    
-    # 分类变更
-    new_translations = {}  # 新翻译的项目
-    updated_translations = {}  # 更新的翻译
-    removed_translations = {}  # 删除的翻译
+    """获取JSON中所有的路径和值"""
+    return dict(collect_leaves(data, prefix))
+
+def diff_new_entries(new_items: List[Tuple[str, Any]], old_paths: Dict[str, Any],
+                     en_paths: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """找出一组新文件条目中新增和更新的翻译"""
+    new_translations = {}
+    updated_translations = {}
     
-    # 找出新增和更新的翻译
-    for path, new_value in new_paths.items():
+    for path, new_value in new_items:
         old_value = old_paths.get(path)
-        en_value = en_paths.get(path, "")
         
+        # 只为有变更的条目查询英文原文
         if old_value is None:
             # 新增的项目
             new_translations[path] = {
                 "chinese": new_value,
-                "english": en_value
+                "english": en_paths.get(path, "")
             }
         elif old_value != new_value:
             # 更新的项目
             updated_translations[path] = {
                 "old": old_value,
                 "new": new_value,
-                "english": en_value
+                "english": en_paths.get(path, "")
             }
     
-    # 找出删除的翻译
-    for path, old_value in old_paths.items():
+    return {"new": new_translations, "updated": updated_translations}
+
+def diff_removed_entries(old_items: List[Tuple[str, Any]], new_paths: Dict[str, Any],
+                         en_paths: Mapping[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """找出一组旧文件条目中被删除的翻译"""
+    removed_translations = {}
+    for path, old_value in old_items:
         if path not in new_paths:
             removed_translations[path] = {
                 "chinese": old_value,
                 "english": en_paths.get(path, "")
             }
+    return removed_translations
+
+def analyze_translation_changes(old_zh_file: str, new_zh_file: str, en_file: str = None,
+                                journal: CheckpointJournal = None) -> Dict[str, Any]:
+    """分析翻译变更；提供检查点日志时按顶层分区记录进度，中断后可继续"""
+    print("正在分析翻译变更...")
+    
+    old_data = load_json_file(old_zh_file)
+    new_data = load_json_file(new_zh_file)
+    en_paths = load_english_index(en_file) if en_file and os.path.exists(en_file) else {}
+    
+    old_paths = get_all_paths(old_data)
+    new_paths = get_all_paths(new_data)
+    
+    # 分类变更：新增和更新按新文件的分区计算，删除按旧文件的分区计算
+    units = [
+        (f"new:{index}:{section}", ("new", items))
+        for index, (section, items) in enumerate(group_paths_by_section(new_paths.items()))
+    ]
+    units.extend(
+        (f"removed:{index}:{section}", ("removed", items))
+        for index, (section, items) in enumerate(group_paths_by_section(old_paths.items()))
+    )
+    
+    def diff_section(unit_input):
+        kind, items = unit_input
+        if kind == "new":
+            return diff_new_entries(items, old_paths, en_paths)
+        return diff_removed_entries(items, new_paths, en_paths)
+    
+    new_translations = {}  # 新翻译的项目
+    updated_translations = {}  # 更新的翻译
+    removed_translations = {}  # 删除的翻译
+    
+    for (_, (kind, _)), section_result in zip(units, run_units(units, diff_section, journal)):
+        if kind == "new":
+            new_translations.update(section_result["new"])
+            updated_translations.update(section_result["updated"])
+        else:
+            removed_translations.update(section_result)
+    
+    if isinstance(en_paths, EnglishIndex):
+        en_paths.close()
     
     return {
         "new_translations": new_translations,
@@ -143,156 +180,307 @@ def categorize_changes_by_feature(changes: Dict[str, Any]) -> Dict[str, List[str
     # 移除空分类
     return {k: v for k, v in categories.items() if v}
 
-def generate_pr_title(changes: Dict[str, Any]) -> str:
-    """生成PR标题"""
-    summary = changes["summary"]
-    total_changes = summary["total_changes"]
-    
-    if total_changes == 0:
-        return "docs: 更新中文翻译文件"
-    
-    change_types = []
-    if summary["new_count"] > 0:
-        change_types.append(f"新增{summary['new_count']}项")
-    if summary["updated_count"] > 0:
-        change_types.append(f"更新{summary['updated_count']}项")
-    if summary["removed_count"] > 0:
-        change_types.append(f"删除{summary['removed_count']}项")
-    
-    return f"update zh.json: 中文翻译更新 - {', '.join(change_types)}"
+# 默认模板（zh）。每个片段都是 str.format 格式字符串，可通过 --template 指定的
+# JSON 文件逐项覆盖，以适配不同语言仓库的 PR 规范；字面量花括号需写成 {{ }}。
+# 所有片段都可以使用 {locale}、{new_count}、{updated_count}、{removed_count}、
+# {total_changes} 这些公共字段。
+DEFAULT_TEMPLATE = {
+    # 抽样条数
+    "pr_category_samples": 5,
+    "pr_new_samples": 5,
+    "pr_updated_samples": 3,
+    "commit_new_samples": 3,
+    "commit_updated_samples": 2,
 
-def generate_pr_body(changes: Dict[str, Any], categories: Dict[str, List[str]]) -> str:
-    """生成PR正文"""
+    # PR 标题
+    "pr_title_empty": "docs: 更新中文翻译文件",
+    "pr_title": "update {locale}.json: 中文翻译更新 - {changes}",
+    "pr_change_new": "新增{count}项",
+    "pr_change_updated": "更新{count}项",
+    "pr_change_removed": "删除{count}项",
+    "pr_change_separator": ", ",
+
+    # PR 正文
+    "pr_header": "## 翻译更新摘要\n\n### 📊 更新统计\n\n",
+    "pr_stat_new": "- 🆕 新增翻译: {new_count} 项\n",
+    "pr_stat_updated": "- 🔄 更新翻译: {updated_count} 项\n",
+    "pr_stat_removed": "- 🗑️ 删除翻译: {removed_count} 项\n",
+    "pr_stat_total": "- 📈 总计变更: {total_changes} 项\n\n",
+    "pr_categories_header": "### 🏷️ 变更分类\n\n",
+    "pr_category": "**{category}** ({count} 项)\n",
+    "pr_category_item": "- `{path}`\n",
+    "pr_category_more": "- ... 还有 {remaining} 项\n",
+    "pr_category_footer": "\n",
+    "pr_new_header": "### ✨ 新增翻译示例\n\n",
+    "pr_new_item": "- `{path}`\n",
+    "pr_new_item_english": "  - EN: {english}\n",
+    "pr_new_item_chinese": "  - ZH: {chinese}\n\n",
+    "pr_new_more": "... 还有 {remaining} 项新增翻译\n\n",
+    "pr_updated_header": "### 🔄 更新翻译示例\n\n",
+    "pr_updated_item": "- `{path}`\n",
+    "pr_updated_item_english": "  - EN: {english}\n",
+    "pr_updated_item_change": "  - 旧: {old}\n  - 新: {new}\n\n",
+    "pr_updated_more": "... 还有 {remaining} 项更新翻译\n\n",
+    "pr_footer": (
+        "### 📝 翻译说明\n\n"
+        "- ✅ 所有翻译已经过审核确认\n"
+        "- 🎯 保持了与英文界面的功能对应关系\n"
+        "- 🔤 专业术语翻译保持一致性\n"
+        "- 📱 适配了中文用户的使用习惯\n\n"
+        "### 🧪 测试建议\n\n"
+        "- [ ] 验证界面显示正确\n"
+        "- [ ] 检查中文字符编码\n"
+        "- [ ] 确认功能操作正常\n"
+        "- [ ] 测试设置项生效\n"
+    ),
+
+    # Commit 信息
+    "commit_empty": "docs: update Chinese translation file",
+    "commit_title": "update {locale}.json: {changes}",
+    "commit_change_new": "add {count} translations",
+    "commit_change_updated": "update {count} translations",
+    "commit_change_removed": "remove {count} translations",
+    "commit_change_separator": ", ",
+    "commit_summary": (
+        "Translation update summary:\n"
+        "- New translations: {new_count}\n"
+        "- Updated translations: {updated_count}\n"
+    ),
+    "commit_summary_removed": "- Removed translations: {removed_count}\n",
+    "commit_summary_total": "- Total changes: {total_changes}\n\n",
+    "commit_new_header": "Key new translations:\n",
+    "commit_new_item": "- {path}: {english:.50} -> {chinese:.50}\n",
+    "commit_updated_header": "Key updated translations:\n",
+    "commit_updated_item": "- {path}: {old:.30} -> {new:.30}\n",
+    "commit_more": "- ... and {remaining} more\n",
+    "commit_section_footer": "\n",
+    "commit_footer": "All translations have been reviewed and verified.",
+}
+
+# 除公共字段外，各片段渲染时额外传入的字段及校验用的示例值
+_SAMPLE_FIELDS = {
+    "count": 1, "remaining": 1, "changes": "x", "category": "x",
+    "path": "x", "english": "x", "chinese": "x", "old": "x", "new": "x",
+}
+TEMPLATE_FIELDS = {
+    "pr_title": ("changes",),
+    "pr_change_new": ("count",),
+    "pr_change_updated": ("count",),
+    "pr_change_removed": ("count",),
+    "pr_category": ("category", "count"),
+    "pr_category_item": ("path",),
+    "pr_category_more": ("remaining",),
+    "pr_new_item": ("path",),
+    "pr_new_item_english": ("english",),
+    "pr_new_item_chinese": ("chinese",),
+    "pr_new_more": ("remaining",),
+    "pr_updated_item": ("path",),
+    "pr_updated_item_english": ("english",),
+    "pr_updated_item_change": ("old", "new"),
+    "pr_updated_more": ("remaining",),
+    "commit_title": ("changes",),
+    "commit_change_new": ("count",),
+    "commit_change_updated": ("count",),
+    "commit_change_removed": ("count",),
+    "commit_new_item": ("path", "english", "chinese"),
+    "commit_updated_item": ("path", "old", "new"),
+    "commit_more": ("remaining",),
+}
+
+def validate_template(template: Dict[str, Any]) -> List[str]:
+    """检查模板中的每个片段，返回错误列表
+
+    抽样条数必须是非负整数；分隔符必须是字符串；其他片段必须能用渲染时
+    实际传入的字段完成格式化。
+    """
+    context = {"locale": "zh", "new_count": 0, "updated_count": 0, "removed_count": 0, "total_changes": 0}
+    errors = []
+    for name, fragment in template.items():
+        if name.endswith("_samples"):
+            if not isinstance(fragment, int) or isinstance(fragment, bool) or fragment < 0:
+                errors.append(f"'{name}' 必须是非负整数，实际为 {fragment!r}")
+        elif not isinstance(fragment, str):
+            errors.append(f"'{name}' 必须是字符串，实际为 {fragment!r}")
+        elif not name.endswith("_separator"):
+            fields = {field: _SAMPLE_FIELDS[field] for field in TEMPLATE_FIELDS.get(name, ())}
+            try:
+                fragment.format(**context, **fields)
+            except KeyError as e:
+                errors.append(f"'{name}' 引用了未提供的字段 {e}，可用字段: {', '.join([*context, *fields])}")
+            except (IndexError, ValueError, TypeError, AttributeError) as e:
+                errors.append(f"'{name}' 格式错误: {e}")
+    return errors
+
+def load_template(template_file: str = None) -> Tuple[Dict[str, Any], List[str]]:
+    """加载模板：以默认模板为基础，用模板文件中的片段逐项覆盖，返回 (模板, 错误列表)"""
+    template = dict(DEFAULT_TEMPLATE)
+    if not template_file:
+        return template, []
+
+    try:
+        with open(template_file, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return template, [f"无法读取模板文件 {template_file}: {e}"]
+    if not isinstance(overrides, dict):
+        return template, [f"模板文件 {template_file} 的顶层必须是 JSON 对象"]
+
+    unknown = sorted(set(overrides) - set(DEFAULT_TEMPLATE))
+    if unknown:
+        print(f"警告: 模板 {template_file} 中包含未知片段: {', '.join(unknown)}")
+    template.update(overrides)
+    return template, validate_template(template)
+
+class TemplateRenderer:
+    """将模板片段按公共字段格式化后逐段写入输出流"""
+
+    def __init__(self, template: Dict[str, Any], changes: Dict[str, Any], out: TextIO, locale: str = "zh"):
+        self.template = template
+        self.out = out
+        self.context = dict(changes["summary"], locale=locale)
+
+    def write(self, name: str, **fields):
+        """格式化并写出一个片段"""
+        self.out.write(self.template[name].format(**self.context, **fields))
+
+    def format(self, name: str, **fields) -> str:
+        """格式化一个片段并返回字符串"""
+        return self.template[name].format(**self.context, **fields)
+
+    def format_change_types(self, prefix: str):
+        """写出“新增/更新/删除”变更类型列表"""
+        summary = self.context
+        change_types = []
+        for kind in ("new", "updated", "removed"):
+            if summary[f"{kind}_count"] > 0:
+                change_types.append(self.format(f"{prefix}_change_{kind}", count=summary[f"{kind}_count"]))
+        return self.template[f"{prefix}_change_separator"].join(change_types)
+
+def render_pr_title(changes: Dict[str, Any], out: TextIO, template: Dict[str, Any] = None, locale: str = "zh"):
+    """将PR标题写入输出流"""
+    renderer = TemplateRenderer(template or DEFAULT_TEMPLATE, changes, out, locale)
+    if changes["summary"]["total_changes"] == 0:
+        renderer.write("pr_title_empty")
+    else:
+        renderer.write("pr_title", changes=renderer.format_change_types("pr"))
+
+def render_pr_body(changes: Dict[str, Any], categories: Dict[str, List[str]], out: TextIO,
+                   template: Dict[str, Any] = None, locale: str = "zh"):
+    """将PR正文写入输出流，示例条目通过迭代器抽样，不复制完整列表"""
+    template = template or DEFAULT_TEMPLATE
+    renderer = TemplateRenderer(template, changes, out, locale)
     summary = changes["summary"]
     
-    body = "## 翻译更新摘要\n\n"
-    
     # 统计信息
-    body += "### 📊 更新统计\n\n"
-    body += f"- 🆕 新增翻译: {summary['new_count']} 项\n"
-    body += f"- 🔄 更新翻译: {summary['updated_count']} 项\n"
+    renderer.write("pr_header")
+    renderer.write("pr_stat_new")
+    renderer.write("pr_stat_updated")
     if summary["removed_count"] > 0:
-        body += f"- 🗑️ 删除翻译: {summary['removed_count']} 项\n"
-    body += f"- 📈 总计变更: {summary['total_changes']} 项\n\n"
+        renderer.write("pr_stat_removed")
+    renderer.write("pr_stat_total")
     
-    # 按功能分类
+    # 按功能分类，只显示前几项，避免过长
     if categories:
-        body += "### 🏷️ 变更分类\n\n"
+        limit = template["pr_category_samples"]
+        renderer.write("pr_categories_header")
         for category, paths in categories.items():
-            body += f"**{category}** ({len(paths)} 项)\n"
-            # 只显示前5个，避免过长
-            for path in paths[:5]:
-                body += f"- `{path}`\n"
-            if len(paths) > 5:
-                body += f"- ... 还有 {len(paths) - 5} 项\n"
-            body += "\n"
+            renderer.write("pr_category", category=category, count=len(paths))
+            for path in islice(paths, limit):
+                renderer.write("pr_category_item", path=path)
+            if len(paths) > limit:
+                renderer.write("pr_category_more", remaining=len(paths) - limit)
+            renderer.write("pr_category_footer")
     
     # 重要更新示例
-    if changes["new_translations"]:
-        body += "### ✨ 新增翻译示例\n\n"
-        new_items = list(changes["new_translations"].items())
-        for i, (path, info) in enumerate(new_items[:5]):
+    new_translations = changes["new_translations"]
+    if new_translations:
+        limit = template["pr_new_samples"]
+        renderer.write("pr_new_header")
+        for path, info in islice(new_translations.items(), limit):
             en_text = info.get("english", "")
-            zh_text = info["chinese"]
-            body += f"- `{path}`\n"
+            renderer.write("pr_new_item", path=path)
             if en_text:
-                body += f"  - EN: {en_text}\n"
-            body += f"  - ZH: {zh_text}\n\n"
-        
-        if len(new_items) > 5:
-            body += f"... 还有 {len(new_items) - 5} 项新增翻译\n\n"
-    
-    if changes["updated_translations"]:
-        body += "### 🔄 更新翻译示例\n\n"
-        updated_items = list(changes["updated_translations"].items())
-        for i, (path, info) in enumerate(updated_items[:3]):
-            body += f"- `{path}`\n"
+                renderer.write("pr_new_item_english", english=en_text)
+            renderer.write("pr_new_item_chinese", chinese=info["chinese"])
+        if len(new_translations) > limit:
+            renderer.write("pr_new_more", remaining=len(new_translations) - limit)
+    
+    updated_translations = changes["updated_translations"]
+    if updated_translations:
+        limit = template["pr_updated_samples"]
+        renderer.write("pr_updated_header")
+        for path, info in islice(updated_translations.items(), limit):
+            renderer.write("pr_updated_item", path=path)
             if info.get("english"):
-                body += f"  - EN: {info['english']}\n"
-            body += f"  - 旧: {info['old']}\n"
-            body += f"  - 新: {info['new']}\n\n"
-        
-        if len(updated_items) > 3:
-            body += f"... 还有 {len(updated_items) - 3} 项更新翻译\n\n"
-    
-    # 翻译说明
-    body += "### 📝 翻译说明\n\n"
-    body += "- ✅ 所有翻译已经过审核确认\n"
-    body += "- 🎯 保持了与英文界面的功能对应关系\n"
-    body += "- 🔤 专业术语翻译保持一致性\n"
-    body += "- 📱 适配了中文用户的使用习惯\n\n"
-    
-    body += "### 🧪 测试建议\n\n"
-    body += "- [ ] 验证界面显示正确\n"
-    body += "- [ ] 检查中文字符编码\n"
-    body += "- [ ] 确认功能操作正常\n"
-    body += "- [ ] 测试设置项生效\n"
+                renderer.write("pr_updated_item_english", english=info["english"])
+            renderer.write("pr_updated_item_change", old=info["old"], new=info["new"])
+        if len(updated_translations) > limit:
+            renderer.write("pr_updated_more", remaining=len(updated_translations) - limit)
     
-    return body
+    # 翻译说明与测试建议
+    renderer.write("pr_footer")
 
-def generate_commit_message(changes: Dict[str, Any]) -> str:
-    """生成Git commit信息"""
+def render_commit_message(changes: Dict[str, Any], out: TextIO, template: Dict[str, Any] = None, locale: str = "zh"):
+    """将Git commit信息写入输出流"""
+    template = template or DEFAULT_TEMPLATE
+    renderer = TemplateRenderer(template, changes, out, locale)
     summary = changes["summary"]
-    total_changes = summary["total_changes"]
-    
-    if total_changes == 0:
-        return "docs: update Chinese translation file"
     
-    # 主要的commit信息
-    change_types = []
-    if summary["new_count"] > 0:
-        change_types.append(f"add {summary['new_count']} translations")
-    if summary["updated_count"] > 0:
-        change_types.append(f"update {summary['updated_count']} translations")
-    if summary["removed_count"] > 0:
-        change_types.append(f"remove {summary['removed_count']} translations")
-    
-    # 生成简洁的commit标题
-    commit_title = f"update zh.json: {', '.join(change_types)}"
+    if summary["total_changes"] == 0:
+        renderer.write("commit_empty")
+        return
     
-    # 生成详细的commit正文
-    commit_body = []
+    # 简洁的commit标题
+    renderer.write("commit_title", changes=renderer.format_change_types("commit"))
+    out.write("\n\n")
     
     # 统计信息
-    commit_body.append("Translation update summary:")
-    commit_body.append(f"- New translations: {summary['new_count']}")
-    commit_body.append(f"- Updated translations: {summary['updated_count']}")
+    renderer.write("commit_summary")
     if summary["removed_count"] > 0:
-        commit_body.append(f"- Removed translations: {summary['removed_count']}")
-    commit_body.append(f"- Total changes: {summary['total_changes']}")
-    commit_body.append("")
+        renderer.write("commit_summary_removed")
+    renderer.write("commit_summary_total")
     
     # 重要变更示例
-    if changes["new_translations"]:
-        commit_body.append("Key new translations:")
-        new_items = list(changes["new_translations"].items())
-        for path, info in new_items[:3]:
-            en_text = info.get("english", "")[:50]
-            zh_text = info["chinese"][:50]
-            commit_body.append(f"- {path}: {en_text} -> {zh_text}")
-        if len(new_items) > 3:
-            commit_body.append(f"- ... and {len(new_items) - 3} more")
-        commit_body.append("")
-    
-    if changes["updated_translations"]:
-        commit_body.append("Key updated translations:")
-        updated_items = list(changes["updated_translations"].items())
-        for path, info in updated_items[:2]:
-            old_text = info["old"][:30]
-            new_text = info["new"][:30]
-            commit_body.append(f"- {path}: {old_text} -> {new_text}")
-        if len(updated_items) > 2:
-            commit_body.append(f"- ... and {len(updated_items) - 2} more")
-        commit_body.append("")
-    
-    commit_body.append("All translations have been reviewed and verified.")
-    
-    # 组合完整的commit信息
-    full_commit = commit_title
-    if commit_body:
-        full_commit += "\n\n" + "\n".join(commit_body)
-    
-    return full_commit
+    new_translations = changes["new_translations"]
+    if new_translations:
+        limit = template["commit_new_samples"]
+        renderer.write("commit_new_header")
+        for path, info in islice(new_translations.items(), limit):
+            renderer.write("commit_new_item", path=path, english=info.get("english", ""), chinese=info["chinese"])
+        if len(new_translations) > limit:
+            renderer.write("commit_more", remaining=len(new_translations) - limit)
+        renderer.write("commit_section_footer")
+    
+    updated_translations = changes["updated_translations"]
+    if updated_translations:
+        limit = template["commit_updated_samples"]
+        renderer.write("commit_updated_header")
+        for path, info in islice(updated_translations.items(), limit):
+            renderer.write("commit_updated_item", path=path, old=info["old"], new=info["new"])
+        if len(updated_translations) > limit:
+            renderer.write("commit_more", remaining=len(updated_translations) - limit)
+        renderer.write("commit_section_footer")
+    
+    renderer.write("commit_footer")
+
+def generate_pr_title(changes: Dict[str, Any], template: Dict[str, Any] = None, locale: str = "zh") -> str:
+    """生成PR标题"""
+    buffer = io.StringIO()
+    render_pr_title(changes, buffer, template, locale)
+    return buffer.getvalue()
+
+def generate_pr_body(changes: Dict[str, Any], categories: Dict[str, List[str]],
+                     template: Dict[str, Any] = None, locale: str = "zh") -> str:
+    """生成PR正文"""
+    buffer = io.StringIO()
+    render_pr_body(changes, categories, buffer, template, locale)
+    return buffer.getvalue()
+
+def generate_commit_message(changes: Dict[str, Any], template: Dict[str, Any] = None, locale: str = "zh") -> str:
+    """生成Git commit信息"""
+    buffer = io.StringIO()
+    render_commit_message(changes, buffer, template, locale)
+    return buffer.getvalue()
 
 def generate_commit_commands(commit_message: str, zh_file: str = "zh.json") -> List[str]:
     """生成Git命令序列"""
@@ -317,32 +505,40 @@ def save_commit_info(commit_message: str, commands: List[str], output_file: str
     """保存commit信息到文件"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    content = f"# Git Commit 信息\n\n"
-    content += f"生成时间: {timestamp}\n\n"
-    content += f"## Commit 信息\n\n```\n{commit_message}\n```\n\n"
-    content += f"## Git 命令\n\n"
-    for cmd in commands:
-        content += f"```bash\n{cmd}\n```\n\n"
-    content += f"## 一键执行\n\n"
-    content += f"```bash\n{' && '.join(commands)}\n```\n"
-    
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+        f.write("# Git Commit 信息\n\n")
+        f.write(f"生成时间: {timestamp}\n\n")
+        f.write(f"## Commit 信息\n\n```\n{commit_message}\n```\n\n")
+        f.write("## Git 命令\n\n")
+        for cmd in commands:
+            f.write(f"```bash\n{cmd}\n```\n\n")
+        f.write("## 一键执行\n\n")
+        f.write(f"```bash\n{' && '.join(commands)}\n```\n")
 
 def save_pr_message(title: str, body: str, output_file: str = "pr_message.md"):
     """保存PR信息到文件"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    content = f"# PR 提交信息\n\n"
-    content += f"生成时间: {timestamp}\n\n"
-    content += f"## 标题\n\n{title}\n\n"
-    content += f"## 正文\n\n{body}\n"
-    
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(content)
+        f.write("# PR 提交信息\n\n")
+        f.write(f"生成时间: {timestamp}\n\n")
+        f.write(f"## 标题\n\n{title}\n\n")
+        f.write(f"## 正文\n\n{body}\n")
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="PR 提交信息生成器")
+    parser.add_argument("--template", metavar="FILE",
+                        help="自定义模板 JSON 文件，逐项覆盖默认的 PR/Commit 片段")
+    parser.add_argument("--locale", default="zh",
+                        help="目标语言代码，用于模板中的 {locale} 字段 (默认: zh)")
+    parser.add_argument("--checkpoint", metavar="DIR",
+                        help="按顶层分区记录检查点，中断后使用相同参数重新运行即可从断点继续")
+    return parser.parse_args()
 
 def main():
     """主函数"""
+    args = parse_args()
     print("=== PR 提交信息生成器 ===")
     
     # 文件路径配置
@@ -368,11 +564,28 @@ def main():
         print(f"错误: 找不到翻译后文件 {new_zh_file}")
         return
     
+    # 加载并校验模板，有错误时在写出任何文件之前退出
+    template, template_errors = load_template(args.template)
+    if template_errors:
+        print(f"错误: 模板校验失败，共 {len(template_errors)} 处:")
+        for error in template_errors:
+            print(f"   - {error}")
+        return
+    
     # 分析变更
-    changes = analyze_translation_changes(old_zh_file, new_zh_file, en_file)
+    journal = None
+    if args.checkpoint:
+        try:
+            journal = CheckpointJournal(args.checkpoint, fingerprint(old_zh_file, new_zh_file, en_file))
+        except ValueError as e:
+            print(f"错误: {e}")
+            return
+    changes = analyze_translation_changes(old_zh_file, new_zh_file, en_file, journal)
     
     if changes["summary"]["total_changes"] == 0:
         print("没有发现翻译变更")
+        if journal is not None:
+            journal.clear()
         return
     
     # 保存详细变更信息
@@ -384,12 +597,12 @@ def main():
     categories = categorize_changes_by_feature(changes)
     
     # 生成PR信息
-    title = generate_pr_title(changes)
-    body = generate_pr_body(changes, categories)
+    title = generate_pr_title(changes, template, args.locale)
+    body = generate_pr_body(changes, categories, template, args.locale)
     
     # 生成Commit信息
-    commit_message = generate_commit_message(changes)
-    commit_commands = generate_commit_commands(commit_message, "zh.json")
+    commit_message = generate_commit_message(changes, template, args.locale)
+    commit_commands = generate_commit_commands(commit_message, f"{args.locale}.json")
     
     # 保存PR信息
     save_pr_message(title, body, output_file)
@@ -397,6 +610,10 @@ def main():
     # 保存Commit信息
     save_commit_info(commit_message, commit_commands, commit_file)
     
+    # 所有输出已写完，检查点不再需要
+    if journal is not None:
+        journal.clear()
+    
     # 输出结果
     print("\n=== 生成的PR信息 ===")
     print(f"\n标题:")
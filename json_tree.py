@@ -0,0 +1,83 @@
+from typing import Any, Iterator, List, Tuple
+
+def _children(node: Any):
+    """返回容器节点的 (是否为数组, 子节点迭代器)"""
+    if isinstance(node, dict):
+        return False, iter(node.items())
+    return True, enumerate(node)
+
+def iter_leaves(data: Any, prefix: str = "", with_keys: bool = False) -> Iterator[Tuple]:
+    """按文档顺序遍历JSON中所有的叶子节点，返回 (路径, 值)
+
+    with_keys 为 True 时返回 (路径, 键或下标, 值)，供需要区分对象键与数组
+    下标的调用方使用。
+
+    使用显式栈代替递归，嵌套深度不受解释器递归上限限制。路径格式与原先的
+    递归实现一致：对象键用 '.' 连接，数组下标写作 '[i]'。空对象和空数组不
+    产生任何叶子节点。
+    """
+    if not isinstance(data, (dict, list)):
+        return
+
+    stack = [(prefix, *_children(data))]
+    while stack:
+        prefix, in_list, items = stack[-1]
+        # 数组与对象分开循环，避免在每个叶子上重复判断路径格式
+        if in_list:
+            for index, value in items:
+                path = f"{prefix}[{index}]"
+                if isinstance(value, (dict, list)):
+                    stack.append((path, *_children(value)))
+                    break
+                yield (path, index, value) if with_keys else (path, value)
+            else:
+                stack.pop()
+        else:
+            for key, value in items:
+                path = f"{prefix}.{key}" if prefix else key
+                if isinstance(value, (dict, list)):
+                    stack.append((path, *_children(value)))
+                    break
+                yield (path, key, value) if with_keys else (path, value)
+            else:
+                stack.pop()
+
+def collect_leaves(data: Any, prefix: str = "") -> List[Tuple[str, Any]]:
+    """iter_leaves 的列表版本，需要完整列表时使用；结果与 list(iter_leaves(data, prefix)) 相同"""
+    leaves = []
+    containers = (dict, list)
+    if not isinstance(data, containers):
+        return leaves
+
+    append = leaves.append
+    is_instance = isinstance
+    stack = [(prefix, *_children(data))]
+    push = stack.append
+    while stack:
+        prefix, in_list, items = stack[-1]
+        if in_list:
+            for index, value in items:
+                if is_instance(value, containers):
+                    push((f"{prefix}[{index}]", *_children(value)))
+                    break
+                append((f"{prefix}[{index}]", value))
+            else:
+                stack.pop()
+        elif prefix:
+            base = f"{prefix}."
+            for key, value in items:
+                if is_instance(value, containers):
+                    push((f"{base}{key}", *_children(value)))
+                    break
+                append((f"{base}{key}", value))
+            else:
+                stack.pop()
+        else:
+            for key, value in items:
+                if is_instance(value, containers):
+                    push((key, *_children(value)))
+                    break
+                append((key, value))
+            else:
+                stack.pop()
+    return leaves
@@ -1,36 +1,38 @@
+import argparse
+import glob
+import hashlib
 import json
 import copy
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from analyze_translations import get_top_level_section
+from checkpoint import CheckpointJournal, fingerprint, run_units
+from json_tree import collect_leaves, iter_leaves
+
+# 中文字符范围 (CJK 统一表意文字)
+_CHINESE_CHAR = re.compile("[\u4e00-\u9fff]")
 
 def find_untranslated(obj, path=""):
     untranslated = {}
 
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            new_path = f"{path}.{key}" if path else key
-            if isinstance(value, (dict, list)):
-                result = find_untranslated(value, new_path)
-                if result:
-                    untranslated.update(result)
-            elif isinstance(value, str):
-                # 判断是否为未翻译的英文（纯 ASCII 且不含中文）
-                key_simple = key.lower().replace("-", "").replace("_", "")
-                val_simple = value.lower().replace(" ", "").replace("-", "").replace("_", "")
-                is_ascii = val_simple.isascii()
-                has_chinese = any("\u4e00" <= c <= "\u9fff" for c in value)
-                if not has_chinese and (val_simple == key_simple or is_ascii):
-                    untranslated[new_path] = value
-    elif isinstance(obj, list):
-        for i, item in enumerate(obj):
-            new_path = f"{path}[{i}]"
-            if isinstance(item, (dict, list)):
-                result = find_untranslated(item, new_path)
-                if result:
-                    untranslated.update(result)
-            elif isinstance(item, str):
-                has_chinese = any("\u4e00" <= c <= "\u9fff" for c in item)
-                if not has_chinese and item.isascii():
-                    untranslated[new_path] = item
+    for leaf_path, key, value in iter_leaves(obj, path, with_keys=True):
+        if not isinstance(value, str):
+            continue
+        has_chinese = _CHINESE_CHAR.search(value) is not None
+        if isinstance(key, int):
+            # 数组元素：纯 ASCII 且不含中文
+            if not has_chinese and value.isascii():
+                untranslated[leaf_path] = value
+        else:
+            # 判断是否为未翻译的英文（纯 ASCII 且不含中文）
+            key_simple = key.lower().replace("-", "").replace("_", "")
+            val_simple = value.lower().replace(" ", "").replace("-", "").replace("_", "")
+            is_ascii = val_simple.isascii()
+            if not has_chinese and (val_simple == key_simple or is_ascii):
+                untranslated[leaf_path] = value
     return untranslated
 
 def set_nested_value(obj, path, value):
@@ -75,18 +77,257 @@ def set_nested_value(obj, path, value):
     else:
         current[final_key] = value
 
-def merge_translations(original_data, translations):
-    """将翻译结果合并回原始数据"""
-    result = copy.deepcopy(original_data)
+def is_grouped_worksheet(entries):
+    """判断翻译文件是否为按英文原文分组的工作表格式"""
+    return bool(entries) and all(
+        isinstance(group, dict) and "paths" in group for group in entries.values()
+    )
+
+def expand_grouped_translations(grouped):
+    """将分组工作表展开为 {路径: 译文}，overrides 中的译文优先
+
+    返回 (翻译, 错误列表)；overrides 不是对象或其中的路径不属于本组时记为错误，
+    避免拼写错误的路径被当作新条目合并进去。
+    """
+    translations = {}
+    errors = []
+    for en_text, group in grouped.items():
+        translation = group.get("translation", en_text)
+        translations.update(dict.fromkeys(group["paths"], translation))
+        overrides = group.get("overrides")
+        if not overrides:
+            continue
+        if not isinstance(overrides, dict):
+            errors.append(f"分组 '{en_text}' 的 overrides 必须是对象")
+            continue
+        group_paths = set(group["paths"])
+        unknown = [path for path in overrides if path not in group_paths]
+        if unknown:
+            errors.extend(f"分组 '{en_text}' 的 overrides 中的路径 '{path}' 不在 paths 中" for path in unknown)
+            continue
+        translations.update(overrides)
     
+    return translations, errors
+
+def load_translation_file(filepath, valid_paths=None):
+    """读取并校验单个翻译文件，返回 ({路径: 译文}, 错误列表)
+
+    给出 valid_paths 时，不在其中的路径（中文文件里不存在的条目）也记为错误。
+    """
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return {}, [f"{filepath}: 无法读取 ({e})"]
+
+    if not isinstance(entries, dict):
+        return {}, [f"{filepath}: 顶层必须是 JSON 对象"]
+
+    errors = []
+    if is_grouped_worksheet(entries):
+        entries, group_errors = expand_grouped_translations(entries)
+        errors.extend(f"{filepath}: {error}" for error in group_errors)
+
+    errors += [
+        f"{filepath}: 路径 '{path}' 的译文不是字符串"
+        for path, value in entries.items()
+        if not isinstance(value, str)
+    ]
+    if valid_paths is not None:
+        errors += [
+            f"{filepath}: 路径 '{path}' 在中文文件中不存在"
+            for path in entries
+            if path not in valid_paths
+        ]
+    return entries, errors
+
+def load_shards(shard_dir, valid_paths=None, max_workers=None):
+    """读取目录中的所有分片文件，按文件名顺序返回 [(文件, 条目)] 和错误列表
+
+    线程池只让各分片的文件读取相互重叠；JSON 解析和校验受 GIL 限制，实际上仍是
+    逐个执行的。分片通常只有几十 KB，进程池的启动和回传开销会超过解析本身。
+    """
+    shard_files = sorted(glob.glob(os.path.join(shard_dir, "*.json")))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(partial(load_translation_file, valid_paths=valid_paths), shard_files))
+
+    shards = []
+    errors = []
+    for shard_file, (entries, shard_errors) in zip(shard_files, results):
+        shards.append((shard_file, entries))
+        errors.extend(shard_errors)
+    return shards, errors
+
+def combine_shards(shards):
+    """合并所有分片为一份翻译，返回 (翻译, 冲突)；冲突为不同分片对同一路径给出的不同译文"""
+    translations = {}
+    sources = {}
+    conflicts = {}
+
+    for shard_file, entries in shards:
+        for path, value in entries.items():
+            if path not in translations:
+                translations[path] = value
+                sources[path] = shard_file
+            elif translations[path] != value:
+                conflict = conflicts.setdefault(path, {sources[path]: translations[path]})
+                conflict[shard_file] = value
+
+    return translations, conflicts
+
+def merge_translations(original_data, translations, journal=None):
+    """将翻译结果合并回原始数据；提供检查点日志时按顶层分区记录进度，中断后可继续"""
+    if journal is None or not isinstance(original_data, dict):
+        result = copy.deepcopy(original_data)
+        
+        for path, translated_value in translations.items():
+            set_nested_value(result, path, translated_value)
+        
+        return result
+
+    # 按顶层分区分组，分区内保持原有的写入顺序
+    sections = {}
     for path, translated_value in translations.items():
-        set_nested_value(result, path, translated_value)
-    
+        sections.setdefault(get_top_level_section(path), []).append((path, translated_value))
+
+    def merge_section(unit_input):
+        section, entries = unit_input
+        holder = {}
+        if section in original_data:
+            holder[section] = copy.deepcopy(original_data[section])
+        for path, translated_value in entries:
+            set_nested_value(holder, path, translated_value)
+        return holder[section]
+
+    units = [(f"{index}:{section}", (section, entries)) for index, (section, entries) in enumerate(sections.items())]
+    merged_sections = dict(zip(sections, run_units(units, merge_section, journal)))
+
+    result = {}
+    for key, value in original_data.items():
+        result[key] = merged_sections.pop(key) if key in merged_sections else copy.deepcopy(value)
+    result.update(merged_sections)
     return result
 
+# 三方合并中表示“该路径不存在”的占位值
+_MISSING = object()
+
+def build_subtree_hashes(root, hashes):
+    """自底向上为每个 dict/list 子树计算内容哈希，写入 hashes[id(子树)]"""
+    stack = [(root, False)]
+    while stack:
+        node, children_hashed = stack.pop()
+        if not isinstance(node, (dict, list)):
+            continue
+
+        if not children_hashed:
+            stack.append((node, True))
+            children = node.values() if isinstance(node, dict) else node
+            stack.extend((child, False) for child in children if isinstance(child, (dict, list)))
+            continue
+
+        if isinstance(node, dict):
+            digest = hashlib.sha1(b"{")
+            # 键顺序不影响相等性，与 dict 的比较语义保持一致
+            for key in sorted(node):
+                digest.update(json.dumps(key).encode("utf-8") + b":")
+                digest.update(_child_digest(node[key], hashes))
+        else:
+            digest = hashlib.sha1(b"[")
+            for child in node:
+                digest.update(_child_digest(child, hashes))
+        hashes[id(node)] = digest.digest()
+
+    return hashes
+
+def _child_digest(child, hashes):
+    """返回子节点参与父节点哈希的字节串"""
+    if isinstance(child, (dict, list)):
+        return b"#" + hashes[id(child)]
+    return b"=" + json.dumps(child, ensure_ascii=False).encode("utf-8") + b"\0"
+
+def _subtree_equal(a, b, hashes):
+    """利用子树哈希判断两个节点内容是否相同"""
+    if isinstance(a, (dict, list)) and isinstance(b, (dict, list)):
+        return hashes[id(a)] == hashes[id(b)]
+    return type(a) is type(b) and a == b
+
+def three_way_merge(base, upstream, ours):
+    """三方合并：以 base 为共同祖先，合并 upstream 与 ours 的改动
+
+    只有三方哈希不同的分支才会被展开比较。双方都修改了同一位置且结果不同
+    时记为冲突，合并结果保留 upstream 的值。返回 (合并结果, 冲突列表)，
+    合并结果可能与输入共享未改动的子树。
+    """
+    hashes = {}
+    for tree in (base, upstream, ours):
+        build_subtree_hashes(tree, hashes)
+
+    holder = {}
+    conflicts = {}
+    stack = [("", base, upstream, ours, holder, "root")]
+
+    while stack:
+        path, base_node, upstream_node, ours_node, parent, key = stack.pop()
+
+        if _subtree_equal(upstream_node, ours_node, hashes) or _subtree_equal(base_node, ours_node, hashes):
+            value = upstream_node
+        elif _subtree_equal(base_node, upstream_node, hashes):
+            value = ours_node
+        elif all(isinstance(node, dict) for node in (base_node, upstream_node, ours_node)):
+            # 三方都是对象：逐键展开，保持 upstream 的键顺序，ours 新增的键追加在后
+            merged = {}
+            parent[key] = merged
+            child_keys = list(upstream_node)
+            child_keys.extend(k for k in ours_node if k not in upstream_node)
+            for child_key in child_keys:
+                merged[child_key] = None
+                stack.append((
+                    f"{path}.{child_key}" if path else child_key,
+                    base_node.get(child_key, _MISSING),
+                    upstream_node.get(child_key, _MISSING),
+                    ours_node.get(child_key, _MISSING),
+                    merged,
+                    child_key,
+                ))
+            continue
+        elif (all(isinstance(node, list) for node in (base_node, upstream_node, ours_node))
+              and len(base_node) == len(upstream_node) == len(ours_node)):
+            # 三方都是等长数组：逐项展开
+            merged = [None] * len(upstream_node)
+            parent[key] = merged
+            for i in range(len(merged)):
+                stack.append((f"{path}[{i}]", base_node[i], upstream_node[i], ours_node[i], merged, i))
+            continue
+        else:
+            # 双方都改动且结果不同：记录冲突，保留 upstream
+            conflicts[path] = {
+                name: node
+                for name, node in (("base", base_node), ("upstream", upstream_node), ("ours", ours_node))
+                if node is not _MISSING
+            }
+            value = upstream_node
+
+        if value is _MISSING:
+            del parent[key]
+        else:
+            parent[key] = value
+
+    return holder.get("root"), conflicts
+
+def parse_args():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="将手动翻译合并到中文语言文件中")
+    parser.add_argument("--shards", metavar="DIR",
+                        help="从目录中读取多个分片翻译文件并统一合并，代替 manual_translations.json")
+    parser.add_argument("--upstream", metavar="FILE",
+                        help="三方合并模式：以 input/zh.json 为共同祖先，将翻译与更新后的上游 zh.json 合并")
+    parser.add_argument("--checkpoint", metavar="DIR",
+                        help="按顶层分区记录检查点，中断后使用相同参数重新运行即可从断点继续")
+    return parser.parse_args()
 
 def main():
     """主函数：将手动翻译的文件合并到中文语言文件中。"""
+    args = parse_args()
     print("=== 开始合并翻译文件 ===")
 
     # 定义文件路径
@@ -95,6 +336,8 @@ def main():
     original_zh_file = os.path.join(input_dir, "zh.json")
     manual_translations_file = os.path.join(input_dir, "manual_translations.json")
     merged_file = os.path.join(output_dir, "zh_translated.json")
+    conflicts_file = os.path.join(output_dir, "shard_conflicts.json")
+    merge_conflicts_file = os.path.join(output_dir, "merge_conflicts.json")
 
     # 确保输入输出目录存在
     os.makedirs(input_dir, exist_ok=True)
@@ -105,31 +348,104 @@ def main():
         print(f"❌ 错误: 找不到原始中文文件 {original_zh_file}")
         return
 
-    if not os.path.exists(manual_translations_file):
+    if args.shards:
+        if not os.path.isdir(args.shards):
+            print(f"❌ 错误: 找不到分片目录 {args.shards}")
+            return
+    elif not os.path.exists(manual_translations_file):
         print(f"❌ 错误: 找不到手动翻译文件 {manual_translations_file}")
         print(f"💡 提示: 请先运行 'python analyze_translations.py' 生成待翻译文件，")
         print(f"   完成后将其复制并重命名为 {manual_translations_file} 并放入 '{input_dir}/' 目录。")
         return
 
+    if args.upstream and not os.path.exists(args.upstream):
+        print(f"❌ 错误: 找不到上游中文文件 {args.upstream}")
+        return
+
     # 读取原始中文数据
     print(f"📖 正在读取原始文件: {original_zh_file}")
     with open(original_zh_file, "r", encoding="utf-8") as f:
         original_data = json.load(f)
 
-    # 读取手动翻译的数据
-    print(f"📖 正在读取翻译文件: {manual_translations_file}")
-    with open(manual_translations_file, "r", encoding="utf-8") as f:
-        translated_entries = json.load(f)
+    if args.shards:
+        # 读取并校验所有分片
+        print(f"📖 正在读取分片目录: {args.shards}")
+        shards, errors = load_shards(args.shards, {path for path, _ in collect_leaves(original_data)})
+        if not shards:
+            print(f"❌ 错误: 分片目录 {args.shards} 中没有 .json 文件")
+            return
+        if errors:
+            print(f"❌ 错误: {len(errors)} 处分片校验失败:")
+            for error in errors:
+                print(f"   - {error}")
+            return
+
+        translated_entries, conflicts = combine_shards(shards)
+        print(f"📦 已读取 {len(shards)} 个分片，共 {len(translated_entries)} 条翻译")
+        if not conflicts and os.path.exists(conflicts_file):
+            # 冲突已解决，删除上次遗留的冲突报告
+            os.remove(conflicts_file)
+        if conflicts:
+            with open(conflicts_file, "w", encoding="utf-8") as f:
+                json.dump(conflicts, f, ensure_ascii=False, indent=2)
+            print(f"❌ 发现 {len(conflicts)} 处冲突：不同分片对同一路径给出了不同译文")
+            for path in list(conflicts)[:5]:
+                print(f"   - {path}")
+            print(f"💡 提示: 冲突详情已保存到 {conflicts_file}，请统一译文后重新合并。")
+            return
+    else:
+        # 读取手动翻译的数据
+        print(f"📖 正在读取翻译文件: {manual_translations_file}")
+        with open(manual_translations_file, "r", encoding="utf-8") as f:
+            translated_entries = json.load(f)
+
+        if is_grouped_worksheet(translated_entries):
+            print(f"🔀 检测到分组工作表，共 {len(translated_entries)} 组，正在展开到各路径...")
+            translated_entries, errors = expand_grouped_translations(translated_entries)
+            if errors:
+                print(f"❌ 错误: {len(errors)} 处分组校验失败:")
+                for error in errors:
+                    print(f"   - {error}")
+                return
 
     # 合并翻译
     print("🔄 正在合并翻译...")
-    final_data = merge_translations(original_data, translated_entries)
+    journal = None
+    if args.checkpoint:
+        try:
+            journal = CheckpointJournal(
+                args.checkpoint,
+                fingerprint(original_zh_file, list(translated_entries.items())),
+            )
+        except ValueError as e:
+            print(f"❌ 错误: {e}")
+            return
+    final_data = merge_translations(original_data, translated_entries, journal)
+
+    if args.upstream:
+        # 三方合并：base 为 input/zh.json，ours 为合并翻译后的结果
+        print(f"📖 正在读取上游文件: {args.upstream}")
+        with open(args.upstream, "r", encoding="utf-8") as f:
+            upstream_data = json.load(f)
+
+        print("🔀 正在进行三方合并...")
+        final_data, merge_conflicts = three_way_merge(original_data, upstream_data, final_data)
+        with open(merge_conflicts_file, "w", encoding="utf-8") as f:
+            json.dump(merge_conflicts, f, ensure_ascii=False, indent=2)
+        if merge_conflicts:
+            print(f"⚠️ 发现 {len(merge_conflicts)} 处冲突，已保留上游的值，详情见 {merge_conflicts_file}")
+        else:
+            print("✅ 三方合并无冲突")
 
     # 保存最终结果
     print(f"💾 正在保存合并后的文件到: {merged_file}")
     with open(merged_file, "w", encoding="utf-8") as f:
         json.dump(final_data, f, ensure_ascii=False, indent="\t")
 
+    # 所有输出已写完，检查点不再需要
+    if journal is not None:
+        journal.clear()
+
     print(f"\n🎉 合并完成！最终文件已保存为 {merged_file}")
     print("\n💡 下一步: 运行 'python generate_pr_message.py' 生成PR和Commit信息。")
 
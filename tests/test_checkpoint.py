@@ -0,0 +1,61 @@
+"""checkpoint.CheckpointJournal 的中断恢复与清理测试"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from checkpoint import CheckpointJournal
+
+
+def test_resume_after_torn_journal_tail(tmp_path):
+    directory = str(tmp_path / "ck")
+    journal = CheckpointJournal(directory, "fp")
+    journal.record("u0", {"value": 0})
+    # 模拟追加记录时崩溃，只写入了半行
+    with open(journal.journal_file, "a", encoding="utf-8") as f:
+        f.write('{"unit": "u1", "fi')
+
+    journal = CheckpointJournal(directory, "fp")
+    assert "u0" in journal and "u1" not in journal
+    journal.record("u1", {"value": 1})
+    journal.record("u2", {"value": 2})
+
+    journal = CheckpointJournal(directory, "fp")
+    assert [journal.load(unit) for unit in ("u0", "u1", "u2")] == [{"value": 0}, {"value": 1}, {"value": 2}]
+
+    journal.clear()
+    assert not os.path.exists(directory)
+    CheckpointJournal(directory, "fp")  # 目录已清理干净，可以再次使用
+
+
+def test_unit_file_numbers_are_not_reused(tmp_path):
+    directory = str(tmp_path / "ck")
+    journal = CheckpointJournal(directory, "fp")
+    journal.record("u0", 0)
+    journal.record("u1", 1)
+    os.remove(os.path.join(directory, "unit_00000.json"))
+
+    journal = CheckpointJournal(directory, "fp")
+    assert "u0" not in journal
+    journal.record("u0", "again")
+    assert journal.load("u1") == 1
+    assert journal.load("u0") == "again"
+
+
+def test_clear_keeps_files_it_did_not_write(tmp_path):
+    directory = tmp_path / "ck"
+    journal = CheckpointJournal(str(directory), "fp")
+    journal.record("u0", 0)
+    (directory / "keep.txt").write_text("keep")
+
+    CheckpointJournal(str(directory), "other").clear()
+    assert sorted(os.listdir(directory)) == ["keep.txt"]
+
+
+def test_refuses_non_empty_directory_without_journal(tmp_path):
+    (tmp_path / "zh_translated.json").write_text("{}")
+    with pytest.raises(ValueError):
+        CheckpointJournal(str(tmp_path), "fp")
+    assert os.listdir(tmp_path) == ["zh_translated.json"]
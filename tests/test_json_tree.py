@@ -0,0 +1,175 @@
+"""json_tree 显式栈遍历与原递归实现的差分测试
+
+下面冻结了改写前的三个递归函数，在随机生成的 JSON 树上与当前实现逐一比较
+结果和顺序；另外单独验证超出递归上限的深层嵌套。
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analyze_translations
+import generate_pr_message
+import merge_translations
+from json_tree import collect_leaves, iter_leaves
+
+SEED = 20260719
+TREE_COUNT = 3000
+DEEP_NESTING = 50000
+
+
+# ---- 改写前的递归实现（冻结副本，请勿修改）----
+
+def old_get_all_paths_list(data, prefix=""):
+    """analyze_translations.get_all_paths 的原实现"""
+    paths = []
+
+    if isinstance(data, dict):
+        for key, value in data.items():
+            current_path = f"{prefix}.{key}" if prefix else key
+
+            if isinstance(value, (dict, list)):
+                paths.extend(old_get_all_paths_list(value, current_path))
+            else:
+                paths.append((current_path, value))
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            current_path = f"{prefix}[{i}]"
+            if isinstance(value, (dict, list)):
+                paths.extend(old_get_all_paths_list(value, current_path))
+            else:
+                paths.append((current_path, value))
+
+    return paths
+
+
+def old_get_all_paths_dict(data, prefix=""):
+    """generate_pr_message.get_all_paths 的原实现"""
+    paths = {}
+
+    if isinstance(data, dict):
+        for key, value in data.items():
+            current_path = f"{prefix}.{key}" if prefix else key
+
+            if isinstance(value, (dict, list)):
+                paths.update(old_get_all_paths_dict(value, current_path))
+            else:
+                paths[current_path] = value
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            current_path = f"{prefix}[{i}]"
+            if isinstance(value, (dict, list)):
+                paths.update(old_get_all_paths_dict(value, current_path))
+            else:
+                paths[current_path] = value
+
+    return paths
+
+
+def old_find_untranslated(obj, path=""):
+    """merge_translations.find_untranslated 的原实现"""
+    untranslated = {}
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            new_path = f"{path}.{key}" if path else key
+            if isinstance(value, (dict, list)):
+                result = old_find_untranslated(value, new_path)
+                if result:
+                    untranslated.update(result)
+            elif isinstance(value, str):
+                key_simple = key.lower().replace("-", "").replace("_", "")
+                val_simple = value.lower().replace(" ", "").replace("-", "").replace("_", "")
+                is_ascii = val_simple.isascii()
+                has_chinese = any("\u4e00" <= c <= "\u9fff" for c in value)
+                if not has_chinese and (val_simple == key_simple or is_ascii):
+                    untranslated[new_path] = value
+    elif isinstance(obj, list):
+        for i, item in enumerate(obj):
+            new_path = f"{path}[{i}]"
+            if isinstance(item, (dict, list)):
+                result = old_find_untranslated(item, new_path)
+                if result:
+                    untranslated.update(result)
+            elif isinstance(item, str):
+                has_chinese = any("\u4e00" <= c <= "\u9fff" for c in item)
+                if not has_chinese and item.isascii():
+                    untranslated[new_path] = item
+    return untranslated
+
+
+# ---- 随机树生成 ----
+
+KEYS = ["name", "desc", "button-ok", "Button_OK", "a.b", "x[0]", "", "中文键", "é", "0", "Cancel"]
+STRINGS = ["OK", "ok", "button ok", "Cancel", "确定", "取消 Cancel", "", " ", "café", "a-b_c", "丂", "龥", "〇"]
+SCALARS = [0, 1, -2.5, True, False, None]
+
+
+def random_value(rng, depth):
+    """生成一个随机 JSON 值；越深越倾向于生成叶子"""
+    roll = rng.random()
+    if depth <= 0 or roll < 0.45:
+        return rng.choice(STRINGS) if rng.random() < 0.8 else rng.choice(SCALARS)
+    if roll < 0.75:
+        return {rng.choice(KEYS) + str(rng.randrange(3)) * rng.randrange(2): random_value(rng, depth - 1)
+                for _ in range(rng.randrange(5))}
+    return [random_value(rng, depth - 1) for _ in range(rng.randrange(5))]
+
+
+def random_trees():
+    rng = random.Random(SEED)
+    for _ in range(TREE_COUNT):
+        tree = random_value(rng, rng.randrange(1, 8))
+        prefix = rng.choice(["", "", "root", "a.b", "x[1]"])
+        yield tree, prefix
+
+
+# ---- 测试 ----
+
+def test_get_all_paths_list_matches_recursive():
+    for tree, prefix in random_trees():
+        expected = old_get_all_paths_list(tree, prefix)
+        assert analyze_translations.get_all_paths(tree, prefix) == expected
+        assert collect_leaves(tree, prefix) == expected
+        assert list(iter_leaves(tree, prefix)) == expected
+
+
+def test_get_all_paths_dict_matches_recursive():
+    for tree, prefix in random_trees():
+        expected = old_get_all_paths_dict(tree, prefix)
+        actual = generate_pr_message.get_all_paths(tree, prefix)
+        assert actual == expected
+        assert list(actual) == list(expected)
+
+
+def test_find_untranslated_matches_recursive():
+    for tree, prefix in random_trees():
+        expected = old_find_untranslated(tree, prefix)
+        actual = merge_translations.find_untranslated(tree, prefix)
+        assert actual == expected
+        assert list(actual) == list(expected)
+
+
+def test_with_keys_reports_key_or_index():
+    for tree, prefix in random_trees():
+        plain = list(iter_leaves(tree, prefix))
+        keyed = list(iter_leaves(tree, prefix, with_keys=True))
+        assert [(path, value) for path, _, value in keyed] == plain
+        for path, key, _ in keyed:
+            suffix = f"[{key}]" if isinstance(key, int) else key
+            assert path.endswith(suffix)
+
+
+def test_deep_nesting_does_not_recurse():
+    tree = "leaf"
+    for depth in range(DEEP_NESTING):
+        tree = [tree] if depth % 2 else {"k": tree}
+    expected_path = "".join("[0]" if depth % 2 else ".k" for depth in reversed(range(DEEP_NESTING)))
+    expected = [(expected_path.lstrip("."), "leaf")]
+
+    assert collect_leaves(tree) == expected
+    assert analyze_translations.get_all_paths(tree) == expected
+    assert list(iter_leaves(tree)) == expected
+    assert generate_pr_message.get_all_paths(tree) == dict(expected)
+    assert merge_translations.find_untranslated(tree) == dict(expected)